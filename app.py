@@ -1,10 +1,19 @@
-from flask import Flask, jsonify, request, send_from_directory, send_file
+from flask import Flask, Response, jsonify, request, send_from_directory, send_file
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from datetime import datetime, timedelta
+from flask_caching import Cache
+from flask_compress import Compress
+from cachetools import TTLCache
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
 import time
+import threading
 import logging
 import os
 import json
+import hashlib
+import orjson
 
 # Import the Google Sheets manager (from your existing code)
 try:
@@ -14,35 +23,138 @@ except ImportError:
     SHEETS_AVAILABLE = False
     print("⚠️ Google Sheets integration not available")
 
+class OrjsonProvider(JSONProvider):
+    """Route jsonify() and request.get_json() through orjson instead of stdlib json
+    
+    Non-string dict keys (int, None, ...) are converted to strings like the stdlib
+    provider does. Keyword arguments such as default/sort_keys are ignored.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round-trip of the base implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype='application/json')
+
 # Initialize Flask app with static folder for React build
 app = Flask(__name__, static_folder='frontend/build', static_url_path='')
+app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for React app
 
+# Compress JSON/static responses, preferring brotli
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_BR_LEVEL'] = 4
+compress = Compress(app)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# SMART CACHING SYSTEM - Allows manual refresh override
-CACHE = {}
-CACHE_DURATION = 120  # 2 minutes cache for auto-refresh
+# SMART CACHING SYSTEM - Shared across Gunicorn workers via Redis, allows manual refresh override
+CACHE_DURATION = 120  # starting TTL for auto-refresh, adapted to how often orders change
+MIN_CACHE_DURATION = 30
+MAX_CACHE_DURATION = 600
+TTL_CHANGE_FRACTION = 0.5  # refresh about twice per observed change interval
+TTL_EWMA_ALPHA = 0.3  # weight of the newest change interval in the running mean
+STALE_DURATION = 600  # stale data is still served (and refreshed in background) for 10 more minutes
+LOCAL_CACHE_DURATION = 10  # per-worker copy, saves a Redis round-trip + unpickle per request
 FORCE_REFRESH_PARAM = 'force_refresh'
+ORDERS_CACHE_KEY = 'all_orders'
+TTL_STATS_CACHE_KEY = 'orders_ttl_stats'
+REFRESH_WAIT_TIMEOUT = 30  # max seconds to wait on another thread's in-flight fetch
+MAX_BATCH_BOOTHS = 100  # max booths per POST /api/orders/booths request
+
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    cache_config = {
+        'CACHE_TYPE': 'RedisCache',
+        'CACHE_REDIS_URL': REDIS_URL,
+        'CACHE_KEY_PREFIX': 'expo_'  # keeps cache.clear() from flushing the whole Redis DB
+    }
+else:
+    # Per-process fallback for local development
+    cache_config = {'CACHE_TYPE': 'SimpleCache'}
+    logger.warning("REDIS_URL not set - cache is not shared between workers")
+cache_config['CACHE_DEFAULT_TIMEOUT'] = STALE_DURATION
+cache = Cache(app, config=cache_config)
+
+# Bounded in-process layer in front of the shared cache, guarded for threaded workers
+local_cache = TTLCache(maxsize=64, ttl=LOCAL_CACHE_DURATION)
+local_cache_lock = threading.RLock()
+
+# Only one background refresh per worker at a time
+refresh_lock = threading.Lock()
 
-def get_from_cache(key, allow_cache=True):
-    if not allow_cache:
-        logger.info(f"Cache bypassed for {key} (manual refresh)")
+# In-flight fetches per cache key, so concurrent misses share one upstream call
+inflight_fetches = {}
+inflight_lock = threading.Lock()
+
+def shared_cache_get(key):
+    """Read from the shared cache, treating backend errors (e.g. Redis down) as a miss"""
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Shared cache read failed for {key}: {e}")
         return None
-        
-    if key in CACHE:
-        data, timestamp = CACHE[key]
-        if datetime.now() - timestamp < timedelta(seconds=CACHE_DURATION):
-            logger.info(f"Using cached data for {key}")
-            return data
-    return None
-
-def set_cache(key, data):
-    CACHE[key] = (data, datetime.now())
+
+def shared_cache_set(key, value, timeout):
+    """Write to the shared cache, skipping the write on backend errors"""
+    try:
+        cache.set(key, value, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Shared cache write failed for {key}: {e}")
+
+def is_entry_stale(entry):
+    """Check whether a (data, cached_at, ttl) cache entry is past its TTL"""
+    _, cached_at, ttl = entry
+    return time.time() - cached_at >= ttl
+
+def get_from_cache(key):
+    """Return (data, is_stale) for a cached entry, or (None, False) on a miss"""
+    with local_cache_lock:
+        entry = local_cache.get(key)
+    
+    if entry is None or is_entry_stale(entry):
+        # Another worker may already have refreshed the shared copy
+        shared_entry = shared_cache_get(key)
+        if shared_entry is not None:
+            entry = shared_entry
+            with local_cache_lock:
+                local_cache[key] = entry
+        elif entry is None:
+            return None, False
+    
+    data = entry[0]
+    is_stale = is_entry_stale(entry)
+    if not is_stale:
+        logger.info(f"Using cached data for {key}")
+    return data, is_stale
+
+def set_cache(key, data, ttl=CACHE_DURATION):
+    entry = (data, time.time(), ttl)
+    shared_cache_set(key, entry, timeout=ttl + STALE_DURATION)
+    with local_cache_lock:
+        local_cache[key] = entry
     logger.info(f"Cached data for {key}")
 
+# Response timestamps only need second resolution - format at most once per second
+last_timestamp = (None, '')
+
+def current_timestamp():
+    """Return the current local time as an ISO string, cached per second"""
+    global last_timestamp
+    second = int(time.time())
+    cached_second, cached_iso = last_timestamp
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        last_timestamp = (second, cached_iso)
+    return cached_iso
+
 # Initialize Google Sheets Manager
 def get_credentials():
     """Get Google credentials from environment variable or file"""
@@ -79,79 +191,106 @@ else:
 # Your Google Sheet ID
 SHEET_ID = "1zaRPHP3k-K1L0z3Bi_Wk--S1Xe2erOAAVYp78h18UUI"
 
-# Mock data for testing
+# Mock data for testing - built once at import, shared read-only by every fallback
+MOCK_ORDERS = (
+    {
+        'id': 'ORD-2025-001',
+        'booth_number': 'A-245',
+        'exhibitor_name': 'TechFlow Innovations',
+        'item': 'Premium Booth Setup Package',
+        'description': 'Complete booth installation with premium furniture, lighting, and tech setup',
+        'color': 'White',
+        'quantity': 1,
+        'status': 'out-for-delivery',
+        'order_date': 'June 14, 2025',
+        'comments': 'Rush delivery requested',
+        'section': 'Section A'
+    },
+    {
+        'id': 'ORD-2025-002',
+        'booth_number': 'A-245',
+        'exhibitor_name': 'TechFlow Innovations',
+        'item': 'Interactive Display System',
+        'description': '75" 4K touchscreen display with interactive software and mounting',
+        'color': 'Black',
+        'quantity': 1,
+        'status': 'in-route',
+        'order_date': 'June 13, 2025',
+        'comments': '',
+        'section': 'Section A'
+    },
+    {
+        'id': 'ORD-2025-003',
+        'booth_number': 'B-156',
+        'exhibitor_name': 'GreenWave Energy',
+        'item': 'Marketing Materials Bundle',
+        'description': 'Banners, brochures, business cards, and promotional items',
+        'color': 'Green',
+        'quantity': 5,
+        'status': 'delivered',
+        'order_date': 'June 12, 2025',
+        'comments': 'Eco-friendly materials requested',
+        'section': 'Section B'
+    },
+    {
+        'id': 'ORD-2025-004',
+        'booth_number': 'C-089',
+        'exhibitor_name': 'SmartHealth Corp',
+        'item': 'Audio-Visual Equipment',
+        'description': 'Professional sound system, microphones, and presentation equipment',
+        'color': 'White',
+        'quantity': 1,
+        'status': 'in-process',
+        'order_date': 'June 14, 2025',
+        'comments': 'Medical grade equipment required',
+        'section': 'Section C'
+    }
+)
+
 def get_mock_orders():
-    return [
-        {
-            'id': 'ORD-2025-001',
-            'booth_number': 'A-245',
-            'exhibitor_name': 'TechFlow Innovations',
-            'item': 'Premium Booth Setup Package',
-            'description': 'Complete booth installation with premium furniture, lighting, and tech setup',
-            'color': 'White',
-            'quantity': 1,
-            'status': 'out-for-delivery',
-            'order_date': 'June 14, 2025',
-            'comments': 'Rush delivery requested',
-            'section': 'Section A'
-        },
-        {
-            'id': 'ORD-2025-002',
-            'booth_number': 'A-245',
-            'exhibitor_name': 'TechFlow Innovations',
-            'item': 'Interactive Display System',
-            'description': '75" 4K touchscreen display with interactive software and mounting',
-            'color': 'Black',
-            'quantity': 1,
-            'status': 'in-route',
-            'order_date': 'June 13, 2025',
-            'comments': '',
-            'section': 'Section A'
-        },
-        {
-            'id': 'ORD-2025-003',
-            'booth_number': 'B-156',
-            'exhibitor_name': 'GreenWave Energy',
-            'item': 'Marketing Materials Bundle',
-            'description': 'Banners, brochures, business cards, and promotional items',
-            'color': 'Green',
-            'quantity': 5,
-            'status': 'delivered',
-            'order_date': 'June 12, 2025',
-            'comments': 'Eco-friendly materials requested',
-            'section': 'Section B'
-        },
-        {
-            'id': 'ORD-2025-004',
-            'booth_number': 'C-089',
-            'exhibitor_name': 'SmartHealth Corp',
-            'item': 'Audio-Visual Equipment',
-            'description': 'Professional sound system, microphones, and presentation equipment',
-            'color': 'White',
-            'quantity': 1,
-            'status': 'in-process',
-            'order_date': 'June 14, 2025',
-            'comments': 'Medical grade equipment required',
-            'section': 'Section C'
-        }
-    ]
+    return MOCK_ORDERS
 
-def load_orders_from_sheets(force_refresh=False):
-    """Load orders from Google Sheets with smart caching"""
-    cache_key = "all_orders"
+def booth_key(booth_number):
+    """Normalize a booth number for index lookups (applied once per order at ingest)"""
+    return str(booth_number).strip().lower()
+
+def build_orders_payload(orders):
+    """Index, count, pre-serialize and hash orders once per cache refresh"""
+    by_booth = defaultdict(list)
+    delivered_by_booth = Counter()
+    status_counts = Counter()
+    for order in orders:
+        key = booth_key(order['booth_number'])
+        by_booth[key].append(order)
+        status_counts[order['status']] += 1
+        if order['status'] == 'delivered':
+            delivered_by_booth[key] += 1
     
-    # Check cache first (unless force refresh)
-    if not force_refresh:
-        cached_data = get_from_cache(cache_key, allow_cache=True)
-        if cached_data:
-            return cached_data
+    orders_json = orjson.dumps(orders)
+    return {
+        'orders': orders,
+        'orders_json': orders_json,
+        'etag': hashlib.blake2b(orders_json, digest_size=16).hexdigest(),
+        'by_booth': dict(by_booth),
+        'delivered_by_booth': dict(delivered_by_booth),
+        'status_counts': dict(status_counts)
+    }
+
+@lru_cache(maxsize=None)
+def get_mock_payload():
+    """Build the mock orders payload on first fallback and reuse it afterwards"""
+    return build_orders_payload(get_mock_orders())
+
+def load_orders_from_sheets():
+    """Load orders from Google Sheets and build the orders payload
     
+    Returns (payload, is_fallback), where is_fallback is True when the mock
+    data was used because Google Sheets was unavailable or empty.
+    """
     try:
         if not gs_manager:
             logger.warning("No Google Sheets manager available, using mock data")
-            mock_data = get_mock_orders()
-            set_cache(cache_key, mock_data)
-            return mock_data
+            return get_mock_payload(), True
             
         # Get all orders from Google Sheets
         all_orders = []
@@ -163,22 +302,136 @@ def load_orders_from_sheets(force_refresh=False):
                 logger.info(f"Loaded {len(all_orders)} orders from Google Sheets")
             
             if all_orders:
-                set_cache(cache_key, all_orders)
-                if force_refresh:
-                    logger.info("🔄 FORCE REFRESH: Fresh data loaded from Google Sheets")
-                return all_orders
+                return build_orders_payload(all_orders), False
         
         logger.warning("No data found in Google Sheets, using mock data")
-        mock_data = get_mock_orders()
-        set_cache(cache_key, mock_data)
-        return mock_data
+        return get_mock_payload(), True
         
     except Exception as e:
         logger.error(f"Error loading orders from sheets: {e}")
         logger.info("Falling back to mock data")
-        mock_data = get_mock_orders()
-        set_cache(cache_key, mock_data)
-        return mock_data
+        return get_mock_payload(), True
+
+def get_adaptive_ttl(etag):
+    """Derive the orders TTL from how often their content (ETag) has changed
+    
+    Keeps an EWMA of the (capped) intervals between changes in the shared cache.
+    While the data stays unchanged, the time since the last change counts as a
+    lower bound, so the TTL grows when orders are quiet and shrinks when they churn.
+    """
+    now = time.time()
+    stats = shared_cache_get(TTL_STATS_CACHE_KEY)
+    
+    if stats is None:
+        stats = {'etag': etag, 'changed_at': now, 'mean_interval': CACHE_DURATION / TTL_CHANGE_FRACTION}
+        shared_cache_set(TTL_STATS_CACHE_KEY, stats, timeout=0)
+        expected_interval = stats['mean_interval']
+    elif etag != stats['etag']:
+        # Cap each sample so one change after a long quiet period (e.g. overnight)
+        # can't inflate the mean far beyond what MAX_CACHE_DURATION needs
+        interval = min(now - stats['changed_at'], MAX_CACHE_DURATION / TTL_CHANGE_FRACTION)
+        mean_interval = TTL_EWMA_ALPHA * interval + (1 - TTL_EWMA_ALPHA) * stats['mean_interval']
+        stats = {'etag': etag, 'changed_at': now, 'mean_interval': mean_interval}
+        shared_cache_set(TTL_STATS_CACHE_KEY, stats, timeout=0)
+        expected_interval = mean_interval
+    else:
+        # Unchanged data: time since the last change is a lower bound (not stored)
+        expected_interval = max(stats['mean_interval'], now - stats['changed_at'])
+    
+    ttl = min(max(TTL_CHANGE_FRACTION * expected_interval, MIN_CACHE_DURATION), MAX_CACHE_DURATION)
+    logger.info(f"Orders TTL set to {ttl:.0f}s")
+    return ttl
+
+def refresh_orders():
+    """Reload orders from Google Sheets and store them in the shared cache
+    
+    Concurrent callers in the same worker are coalesced: the first one fetches,
+    the others wait for it and read the freshly cached payload.
+    """
+    with inflight_lock:
+        event = inflight_fetches.get(ORDERS_CACHE_KEY)
+        is_owner = event is None
+        if is_owner:
+            event = inflight_fetches[ORDERS_CACHE_KEY] = threading.Event()
+    
+    if not is_owner:
+        event.wait(timeout=REFRESH_WAIT_TIMEOUT)
+        payload, _ = get_from_cache(ORDERS_CACHE_KEY)
+        if payload is not None:
+            return payload
+        # The owning fetch is still stuck on a slow upstream - serve mock data rather
+        # than piling more Sheets calls onto it from every waiting thread
+        logger.warning(f"In-flight fetch for {ORDERS_CACHE_KEY} did not fill the cache, using mock data")
+        return get_mock_payload()
+    
+    try:
+        payload, is_fallback = load_orders_from_sheets()
+        if is_fallback:
+            # Never replace real orders with mock data, nor count it as a change
+            # Re-store whichever payload is kept with a short TTL so the next Sheets
+            # attempt waits MIN_CACHE_DURATION instead of firing on every poll
+            cached_payload, _ = get_from_cache(ORDERS_CACHE_KEY)
+            if cached_payload is not None:
+                logger.warning(f"Sheets refresh fell back to mock data, keeping cached {ORDERS_CACHE_KEY}")
+                payload = cached_payload
+            set_cache(ORDERS_CACHE_KEY, payload, ttl=MIN_CACHE_DURATION)
+            return payload
+        
+        set_cache(ORDERS_CACHE_KEY, payload, ttl=get_adaptive_ttl(payload['etag']))
+        return payload
+    finally:
+        with inflight_lock:
+            inflight_fetches.pop(ORDERS_CACHE_KEY, None)
+        event.set()
+
+def refresh_orders_in_background():
+    """Start a background refresh unless one is already running in this worker"""
+    if not refresh_lock.acquire(blocking=False):
+        return
+    
+    def run():
+        try:
+            refresh_orders()
+        except Exception as e:
+            logger.error(f"Background refresh failed: {e}")
+        finally:
+            refresh_lock.release()
+    
+    threading.Thread(target=run, daemon=True).start()
+
+def get_orders_payload(force_refresh=False):
+    """Get the cached orders payload (stale-while-revalidate, manual refresh override)"""
+    if force_refresh:
+        logger.info("🔄 FORCE REFRESH: Loading fresh data from Google Sheets")
+        return refresh_orders()
+    
+    payload, is_stale = get_from_cache(ORDERS_CACHE_KEY)
+    if payload is None:
+        return refresh_orders()
+    
+    if is_stale:
+        # Serve stale data immediately, the next request gets the fresh copy
+        logger.info(f"Serving stale {ORDERS_CACHE_KEY} while refreshing in background")
+        refresh_orders_in_background()
+    return payload
+
+def etag_matches(etag):
+    """Check If-None-Match, ignoring the ':br'/':gzip' suffix Flask-Compress adds to ETags"""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(tag.split(':', 1)[0] == etag for tag in if_none_match.as_set(include_weak=True))
+
+def not_modified_etag(etag, body):
+    """ETag for a 304, matching what Flask-Compress sends on the 200 for this request
+    
+    Flask-Compress only rewrites 2xx responses, so repeat its ':<encoding>' suffix
+    here using its own Accept-Encoding negotiation.
+    """
+    algorithm = compress._choose_compress_algorithm(request.headers.get('Accept-Encoding', ''))
+    if algorithm is None or len(body) < app.config['COMPRESS_MIN_SIZE']:
+        return etag
+    return f"{etag}:{algorithm}"
 
 # REACT APP SERVING ROUTES
 @app.route('/')
@@ -208,9 +461,9 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy', 
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': current_timestamp(),
         'google_sheets_connected': gs_manager is not None,
-        'cache_size': len(CACHE)
+        'cache_backend': cache_config['CACHE_TYPE']
     })
 
 @app.route('/api/abacus-status', methods=['GET'])
@@ -220,44 +473,31 @@ def abacus_status():
         'platform': 'Expo Convention Contractors',
         'status': 'connected',
         'database': 'Google Sheets Integration',
-        'last_sync': datetime.now().isoformat(),
+        'last_sync': current_timestamp(),
         'version': '3.0.0',
         'cache_enabled': True
     })
 
 @app.route('/api/orders/booth/<booth_number>', methods=['GET'])
 def get_orders_by_booth(booth_number):
-    """Get orders for a specific booth number with smart caching"""
-    cache_key = f"booth_{booth_number}"
+    """Get orders for a specific booth number, filtered from the cached orders"""
     force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
     
-    # Try cache first (unless force refresh)
-    if not force_refresh:
-        cached_data = get_from_cache(cache_key, allow_cache=True)
-        if cached_data:
-            return jsonify(cached_data)
-    
     try:
-        # Get all orders and filter by booth number
-        all_orders = load_orders_from_sheets(force_refresh=force_refresh)
-        booth_orders = [
-            order for order in all_orders 
-            if order['booth_number'].lower() == booth_number.lower()
-        ]
-        
-        delivered_count = len([o for o in booth_orders if o['status'] == 'delivered'])
+        # Look up the booth in the cached all-orders index - no per-booth cache entries
+        payload = get_orders_payload(force_refresh=force_refresh)
+        key = booth_key(booth_number)
+        booth_orders = payload['by_booth'].get(key, [])
         
         result = {
             'booth': booth_number,
             'orders': booth_orders,
             'total_orders': len(booth_orders),
-            'delivered_orders': delivered_count,
-            'last_updated': datetime.now().isoformat(),
+            'delivered_orders': payload['delivered_by_booth'].get(key, 0),
+            'last_updated': current_timestamp(),
             'force_refreshed': force_refresh
         }
         
-        set_cache(cache_key, result)
-        
         if force_refresh:
             logger.info(f"🔄 MANUAL REFRESH: Fresh data for booth {booth_number}")
         
@@ -270,7 +510,51 @@ def get_orders_by_booth(booth_number):
             'orders': [],
             'total_orders': 0,
             'delivered_orders': 0,
-            'last_updated': datetime.now().isoformat(),
+            'last_updated': current_timestamp(),
+            'error': str(e)
+        }), 500
+
+@app.route('/api/orders/booths', methods=['POST'])
+def get_orders_by_booths():
+    """Get orders for several booth numbers in one request"""
+    body = request.get_json(silent=True)
+    booths = body.get('booths') if isinstance(body, dict) else None
+    if not isinstance(booths, list):
+        return jsonify({'error': "Request body must be JSON like {\"booths\": [...]}"}), 400
+    if len(booths) > MAX_BATCH_BOOTHS:
+        return jsonify({'error': f"At most {MAX_BATCH_BOOTHS} booths per request"}), 400
+    
+    # Booth numbers may come as strings or plain integers (e.g. 245)
+    if not all(isinstance(b, (str, int)) and not isinstance(b, bool) for b in booths):
+        return jsonify({'error': "Each booth must be a string or an integer"}), 400
+    
+    # One entry per distinct booth, keyed by the first spelling the client sent
+    unique_booths = {}
+    for booth in booths:
+        unique_booths.setdefault(booth_key(booth), str(booth))
+    
+    force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
+    
+    try:
+        by_booth = get_orders_payload(force_refresh=force_refresh)['by_booth']
+        results = {
+            booth: by_booth.get(key, [])
+            for key, booth in unique_booths.items()
+        }
+        
+        return jsonify({
+            'booths': results,
+            'total_orders': sum(len(orders) for orders in results.values()),
+            'last_updated': current_timestamp(),
+            'force_refreshed': force_refresh
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting orders for booths {booths}: {e}")
+        return jsonify({
+            'booths': {},
+            'total_orders': 0,
+            'last_updated': current_timestamp(),
             'error': str(e)
         }), 500
 
@@ -278,14 +562,25 @@ def get_orders_by_booth(booth_number):
 def get_all_orders():
     """Get all orders with smart caching"""
     force_refresh = request.args.get(FORCE_REFRESH_PARAM, 'false').lower() == 'true'
-    orders = load_orders_from_sheets(force_refresh=force_refresh)
-    return jsonify(orders)
+    payload = get_orders_payload(force_refresh=force_refresh)
+    # Answer 304 if the client's ETag still matches, else the bytes serialized when the cache was filled
+    if etag_matches(payload['etag']):
+        response = Response(status=304)
+        response.set_etag(not_modified_etag(payload['etag'], payload['orders_json']))
+    else:
+        response = Response(payload['orders_json'], mimetype='application/json')
+        response.set_etag(payload['etag'])
+    return response
 
 @app.route('/api/clear-cache', methods=['POST'])
 def clear_cache():
     """Clear all cached data - useful for forcing fresh data"""
-    global CACHE
-    CACHE = {}
+    try:
+        cache.clear()
+    except Exception as e:
+        logger.warning(f"Shared cache clear failed: {e}")
+    with local_cache_lock:
+        local_cache.clear()
     logger.info("🗑️ Cache cleared manually")
     return jsonify({'message': 'Cache cleared successfully'})
 
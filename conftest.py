@@ -0,0 +1,3 @@
+# conftest.py
+# test_data_extraction.py is a manual Abacus AI script (needs abacusai + an API key), not a test module
+collect_ignore = ["test_data_extraction.py"]
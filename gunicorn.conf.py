@@ -0,0 +1,17 @@
+# gunicorn.conf.py
+# Production server settings for the Flask API (used by the Dockerfile)
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers - blocking Google Sheets calls overlap instead of queueing
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Keep connections open between dashboard polls
+keepalive = 5
+
+# Heartbeat files on tmpfs - avoids worker stalls on slow container disks
+worker_tmp_dir = '/dev/shm'
@@ -0,0 +1,52 @@
+# test_app.py
+# Checks the /api/orders ETag / 304 handling together with Flask-Compress
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        client.post('/api/clear-cache')
+        yield client
+
+
+@pytest.mark.parametrize('accept_encoding', [None, 'br', 'gzip', 'br, gzip'])
+def test_orders_304_repeats_the_200_etag(client, accept_encoding):
+    headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {}
+    
+    first = client.get('/api/orders', headers=headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    
+    second = client.get('/api/orders', headers={**headers, 'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+
+
+def test_orders_etag_suffix_follows_encoding(client):
+    plain = client.get('/api/orders')
+    brotli = client.get('/api/orders', headers={'Accept-Encoding': 'br'})
+    
+    assert 'Content-Encoding' not in plain.headers
+    assert brotli.headers['Content-Encoding'] == 'br'
+    assert brotli.headers['ETag'] == plain.headers['ETag'][:-1] + ':br"'
+
+
+def test_orders_etag_matches_across_encodings(client):
+    # A validator cached from a compressed response still matches an uncompressed poll
+    brotli_etag = client.get('/api/orders', headers={'Accept-Encoding': 'br'}).headers['ETag']
+    
+    response = client.get('/api/orders', headers={'If-None-Match': brotli_etag})
+    assert response.status_code == 304
+
+
+def test_orders_stale_etag_gets_full_body(client):
+    response = client.get('/api/orders', headers={'Accept-Encoding': 'br', 'If-None-Match': '"outdated:br"'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.data